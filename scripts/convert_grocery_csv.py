@@ -12,12 +12,16 @@ def main() -> None:
     parser.add_argument("--input", required=True, help="Path to Grocery_Inventory_new_v1.csv")
     parser.add_argument("--out-dir", default="data", help="Output directory for converted CSVs")
     parser.add_argument("--lead-time", type=int, default=7, help="Default lead time in days")
+    parser.add_argument("--format", default="csv", choices=["csv", "parquet"], help="Output file format")
+    parser.add_argument("--chunksize", type=int, default=50_000, help="Input rows converted per batch")
     args = parser.parse_args()
 
     convert_grocery_csv_to_internal(
         input_csv=Path(args.input),
         out_dir=Path(args.out_dir),
         default_lead_time=args.lead_time,
+        file_format=args.format,
+        chunksize=args.chunksize,
     )
     print(f"Converted dataset saved to {Path(args.out_dir).resolve()}")  # noqa: T201
 
@@ -17,6 +17,26 @@ CATEGORIES = [
 ]
 
 
+def _build_month_multiplier() -> np.ndarray:
+    # simple seasonal pattern by category; rows follow CATEGORIES, columns are
+    # months Jan..Dec, and the extra last row (flat) covers unknown categories
+    table = np.ones((len(CATEGORIES) + 1, 12))
+    month = np.arange(1, 13)
+    table[CATEGORIES.index("Electronics")] += np.where((month >= 10) | (month <= 1), 0.6, 0.0)
+    table[CATEGORIES.index("Apparel")] += np.where((month >= 3) & (month <= 5), 0.4, 0.0)
+    table[CATEGORIES.index("Grocery")] += np.where(month == 12, 0.3, 0.1)
+    table[CATEGORIES.index("Beauty")] += np.where(month == 2, 0.2, 0.0)
+    return table
+
+
+MONTH_MULTIPLIER = _build_month_multiplier()
+
+
+def category_codes(categories) -> np.ndarray:
+    """Row index into MONTH_MULTIPLIER per category; unknown categories map to -1."""
+    return pd.Categorical(categories, categories=CATEGORIES).codes.astype(np.intp)
+
+
 def build_products(n_products: int, seed: int) -> pd.DataFrame:
     rng = np.random.default_rng(seed)
     records = []
@@ -39,21 +59,6 @@ def build_products(n_products: int, seed: int) -> pd.DataFrame:
     return pd.DataFrame(records)
 
 
-def seasonal_multiplier(dates: pd.DatetimeIndex, category: str) -> np.ndarray:
-    # simple seasonal pattern by category
-    base = np.ones(len(dates))
-    month = dates.month
-    if category == "Electronics":
-        base += np.where((month >= 10) | (month <= 1), 0.6, 0.0)
-    elif category == "Apparel":
-        base += np.where((month >= 3) & (month <= 5), 0.4, 0.0)
-    elif category == "Grocery":
-        base += np.where(month == 12, 0.3, 0.1)
-    elif category == "Beauty":
-        base += np.where(month == 2, 0.2, 0.0)
-    return base
-
-
 def build_transactions(
     products: pd.DataFrame,
     start: dt.date,
@@ -62,27 +67,30 @@ def build_transactions(
 ) -> pd.DataFrame:
     rng = np.random.default_rng(seed)
     dates = pd.date_range(start=start, end=end, freq="D")
-    rows = []
-    for _, prod in products.iterrows():
-        base_demand = max(2.0, 800.0 / (prod["unit_cost"] + 10.0))
-        weekly_pattern = 1.0 + 0.2 * np.sin(np.arange(len(dates)) * (2 * np.pi / 7))
-        seasonal = seasonal_multiplier(dates, prod["category"])
-        noise = rng.normal(loc=1.0, scale=0.2, size=len(dates))
-        demand = base_demand * weekly_pattern * seasonal * noise
-        demand = np.clip(demand, a_min=0.0, a_max=None)
-        demand = np.round(demand).astype(int)
-        for dt_idx, qty in zip(dates, demand):
-            if qty <= 0:
-                continue
-            rows.append(
-                {
-                    "date": dt_idx.date().isoformat(),
-                    "product_id": prod["product_id"],
-                    "category": prod["category"],
-                    "sales": int(qty),
-                }
-            )
-    return pd.DataFrame(rows)
+    n_days = len(dates)
+    product_ids = products["product_id"].to_numpy()
+    categories = products["category"].to_numpy()
+
+    base_demand = np.maximum(2.0, 800.0 / (products["unit_cost"].to_numpy(dtype=np.float64) + 10.0))
+    weekly_pattern = 1.0 + 0.2 * np.sin(np.arange(n_days) * (2 * np.pi / 7))
+    # (n_products, n_days) seasonal matrix gathered straight from the month table
+    month_idx = dates.month.to_numpy() - 1
+    seasonal = MONTH_MULTIPLIER[category_codes(categories)[:, None], month_idx[None, :]]
+    noise = rng.normal(loc=1.0, scale=0.2, size=(len(products), n_days))
+
+    demand = base_demand[:, None] * weekly_pattern[None, :] * seasonal * noise
+    np.clip(demand, 0.0, None, out=demand)
+    demand = np.rint(demand).astype(np.int32)
+
+    prod_idx, day_idx = np.nonzero(demand > 0)
+    return pd.DataFrame(
+        {
+            "date": dates.to_numpy()[day_idx],
+            "product_id": product_ids[prod_idx],
+            "category": categories[prod_idx],
+            "sales": demand[prod_idx, day_idx],
+        }
+    )
 
 
 def main(
@@ -91,7 +99,10 @@ def main(
     start: str,
     end: str,
     seed: int,
+    file_format: str = "csv",
 ) -> None:
+    if file_format not in ("csv", "parquet"):
+        raise ValueError(f"Unknown file format {file_format}")
     out_dir.mkdir(parents=True, exist_ok=True)
     products = build_products(n_products=n_products, seed=seed)
     transactions = build_transactions(
@@ -100,8 +111,12 @@ def main(
         end=dt.date.fromisoformat(end),
         seed=seed + 7,
     )
-    products.to_csv(out_dir / "products.csv", index=False)
-    transactions.to_csv(out_dir / "transactions.csv", index=False)
+    if file_format == "parquet":
+        products.to_parquet(out_dir / "products.parquet", compression="zstd", index=False)
+        transactions.to_parquet(out_dir / "transactions.parquet", compression="zstd", index=False)
+    else:
+        products.to_csv(out_dir / "products.csv", index=False)
+        transactions.to_csv(out_dir / "transactions.csv", index=False)
     print(
         f"Generated {len(products)} products and {len(transactions)} transactions into {out_dir}"  # noqa: T201
     )
@@ -109,11 +124,12 @@ def main(
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Generate a synthetic inventory dataset")
-    parser.add_argument("--out-dir", default="data", help="Output directory for CSV files")
+    parser.add_argument("--out-dir", default="data", help="Output directory for dataset files")
     parser.add_argument("--products", type=int, default=80, help="Number of products")
     parser.add_argument("--start", default="2023-01-01", help="Start date (ISO format)")
     parser.add_argument("--end", default="2024-12-31", help="End date (ISO format)")
     parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--format", default="csv", choices=["csv", "parquet"], help="Output file format")
     args = parser.parse_args()
     main(
         out_dir=Path(args.out_dir),
@@ -121,4 +137,5 @@ if __name__ == "__main__":
         start=args.start,
         end=args.end,
         seed=args.seed,
+        file_format=args.format,
     )
@@ -12,7 +12,7 @@ def run(args: argparse.Namespace) -> None:
     data_dir = Path(args.data_dir)
     output_dir = Path(args.output_dir)
 
-    if args.generate_synthetic or not (data_dir / "transactions.csv").exists():
+    if args.generate_synthetic or not (data_dir / f"transactions.{args.data_format}").exists():
         print("Generating synthetic dataset...")  # noqa: T201
         generate_synthetic(
             out_dir=data_dir,
@@ -20,6 +20,7 @@ def run(args: argparse.Namespace) -> None:
             start=args.synthetic_start,
             end=args.synthetic_end,
             seed=args.synthetic_seed,
+            file_format=args.data_format,
         )
 
     pipeline_outputs = pipeline.run_pipeline(
@@ -28,22 +29,36 @@ def run(args: argparse.Namespace) -> None:
         model_name=args.model,
         horizon_days=args.horizon,
         plot_examples=args.plot_examples,
+        data_format=args.data_format,
+        output_format=args.output_format,
+        plot_workers=args.plot_workers,
     )
 
-    print(f"ABC classes saved at {output_dir / 'abc_classification.csv'}")  # noqa: T201
-    print(f"Velocity metrics saved at {output_dir / 'velocity_metrics.csv'}")  # noqa: T201
-    print(f"Reorder recommendations saved at {output_dir / 'reorder_recommendations.csv'}")  # noqa: T201
-    print(f"Forecast plots stored in {(output_dir / 'plots').resolve()}")  # noqa: T201
+    suffix = args.output_format
+    print(f"ABC classes saved at {output_dir / f'abc_classification.{suffix}'}")  # noqa: T201
+    print(f"Velocity metrics saved at {output_dir / f'velocity_metrics.{suffix}'}")  # noqa: T201
+    print(f"Reorder recommendations saved at {output_dir / f'reorder_recommendations.{suffix}'}")  # noqa: T201
+    if pipeline_outputs.plots:
+        print(f"Forecast plots stored in {(output_dir / 'plots').resolve()}")  # noqa: T201
     print(f"Processed {len(pipeline_outputs.forecasts)} products for forecasting")  # noqa: T201
 
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Run inventory forecasting pipeline")
     parser.add_argument("--data-dir", default="data", help="Directory containing products.csv & transactions.csv")
+    parser.add_argument("--data-format", default="csv", choices=["csv", "parquet"], help="Format of the input dataset files")
     parser.add_argument("--output-dir", default="outputs", help="Directory to store results")
+    parser.add_argument("--output-format", default="csv", choices=["csv", "feather"], help="Format of the result tables")
     parser.add_argument("--model", default="prophet", choices=["prophet", "lstm_stub"], help="Forecasting model")
     parser.add_argument("--horizon", type=int, default=30, help="Forecast horizon in days")
-    parser.add_argument("--plot-examples", type=int, default=3, help="Number of monthly trend plots to create")
+    parser.add_argument("--plot-examples", type=int, default=3, help="Number of monthly trend plots to create (0 skips all plots)")
+    parser.add_argument(
+        "--plot-workers",
+        type=int,
+        default=1,
+        help="Worker processes for rendering plots; scripts calling run_pipeline need an "
+        "if __name__ == '__main__' guard, otherwise plots render in-process",
+    )
 
     parser.add_argument("--generate-synthetic", action="store_true", help="Generate synthetic dataset before running")
     parser.add_argument("--synthetic-products", type=int, default=80, help="Number of synthetic products")
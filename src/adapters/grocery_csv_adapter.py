@@ -6,7 +6,7 @@ Expected input columns:
   Stock_Quantity, Reorder_Level, Reorder_Quantity, Unit_Price, Sales_Volume,
   Inventory_Turnover_Rate, percentage
 
-Outputs:
+Outputs (CSV by default, or Parquet with ``file_format="parquet"``):
 - products.csv with: product_id, category, lead_time, reorder_level, initial_stock,
   unit_cost, expiration_date, current_stock
 - transactions.csv with: date, product_id, category, sales (synthetic daily demand)
@@ -15,36 +15,73 @@ from __future__ import annotations
 
 from pathlib import Path
 import datetime as dt
-from typing import Optional
 
 import numpy as np
 import pandas as pd
 
 
-def _parse_money(val: object) -> float:
-    if pd.isna(val):
-        return 0.0
-    s = str(val).strip()
-    s = s.replace("$", "").replace(",", "")
-    try:
-        return float(s)
-    except Exception:
-        return 0.0
+# Arrow type aliases for the fixed output layout (used by the Parquet writer)
+PRODUCT_OUTPUT_SCHEMA = {
+    "product_id": "string",
+    "category": "string",
+    "lead_time": "int64",
+    "reorder_level": "int64",
+    "initial_stock": "int64",
+    "unit_cost": "float64",
+    "expiration_date": "date32",
+    "current_stock": "int64",
+}
 
+TRANSACTION_OUTPUT_SCHEMA = {
+    "date": "timestamp[s]",
+    "product_id": "string",
+    "category": "string",
+    "sales": "int64",
+}
 
-def _safe_date(s: object) -> Optional[dt.date]:
-    if pd.isna(s):
-        return None
-    try:
-        return pd.to_datetime(s, errors="coerce").date()
-    except Exception:
-        return None
 
+def _build_transactions(df: pd.DataFrame, products: pd.DataFrame, rng: np.random.Generator) -> pd.DataFrame:
+    """Spread each product's Sales_Volume over its received..last-order date range."""
+    today = np.datetime64(dt.date.today(), "D")
+    start = df["Date_Received_parsed"].to_numpy(dtype="datetime64[D]")
+    end = df["Last_Order_Date_parsed"].to_numpy(dtype="datetime64[D]")
+    start = np.where(np.isnat(start), today - np.timedelta64(90, "D"), start)
+    end = np.where(np.isnat(end), today, end)
+    start, end = np.minimum(start, end), np.maximum(start, end)
+    totals = pd.to_numeric(df.get("Sales_Volume", 0), errors="coerce")
+    totals = pd.Series(totals, index=df.index).fillna(0).to_numpy().astype(np.int64)
 
-def convert_grocery_csv_to_internal(input_csv: Path, out_dir: Path, default_lead_time: int = 7) -> None:
-    out_dir.mkdir(parents=True, exist_ok=True)
-    df = pd.read_csv(input_csv)
+    keep = totals > 0
+    start, end, totals = start[keep], end[keep], totals[keep]
+    lengths = (end - start).astype(np.int64) + 1
+    offsets = np.cumsum(lengths) - lengths
+    owner = np.repeat(np.arange(len(lengths)), lengths)
+    dates = start[owner] + (np.arange(lengths.sum()) - offsets[owner])
 
+    # Weekday profile (more sales on weekends for grocery?)
+    # Monday=0; 1970-01-01 was a Thursday
+    weekday = (dates.view("int64") + 3) % 7
+    weights = np.where(weekday >= 5, 1.3, 1.0)  # Sat/Sun +30%
+    base = weights / np.bincount(owner, weights=weights, minlength=len(lengths))[owner]
+    # Allocate integer sales across days
+    alloc = np.floor(base * totals[owner]).astype(np.int64)
+    remainders = totals - np.bincount(owner, weights=alloc, minlength=len(lengths)).astype(np.int64)
+    # Leftover units land on uniformly drawn days of their own product; bincount
+    # tallies repeated picks, so collisions are counted rather than lost
+    rem_owner = np.repeat(np.arange(len(lengths)), remainders)
+    picks = offsets[rem_owner] + rng.integers(0, lengths[rem_owner])
+    alloc += np.bincount(picks, minlength=len(alloc))
+
+    sold = alloc > 0
+    return pd.DataFrame({
+        "date": dates[sold],
+        "product_id": products["product_id"].to_numpy()[keep][owner[sold]],
+        "category": products["category"].to_numpy()[keep][owner[sold]],
+        "sales": alloc[sold],
+    })
+
+
+def _normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
     # Normalize column names
     cols = {c: c.strip() for c in df.columns}
     df = df.rename(columns=cols)
@@ -52,14 +89,20 @@ def convert_grocery_csv_to_internal(input_csv: Path, out_dir: Path, default_lead
     if "Catagory" in df.columns:
         df = df.rename(columns={"Catagory": "Category"})
 
-    # Parse fields
-    df["Date_Received_parsed"] = df["Date_Received"].apply(_safe_date)
-    df["Last_Order_Date_parsed"] = df["Last_Order_Date"].apply(_safe_date)
-    df["Expiration_Date_parsed"] = df["Expiration_Date"].apply(_safe_date)
-    df["Unit_Cost"] = df["Unit_Price"].apply(_parse_money)
+    # Parse fields; "mixed" parses each value on its own instead of guessing one
+    # format per chunk, so rows in another format don't silently become NaT
+    for col in ("Date_Received", "Last_Order_Date", "Expiration_Date"):
+        df[f"{col}_parsed"] = pd.to_datetime(df[col], format="mixed", errors="coerce")
+    df["Unit_Cost"] = (
+        df["Unit_Price"].astype(str).str.replace(r"[\s$,]", "", regex=True)
+        .pipe(pd.to_numeric, errors="coerce")
+        .fillna(0.0)
+    )
+    return df
 
-    # Build products.csv
-    products = pd.DataFrame({
+
+def _build_products(df: pd.DataFrame, default_lead_time: int) -> pd.DataFrame:
+    return pd.DataFrame({
         "product_id": df["Product_ID"].astype(str),
         "category": df.get("Category", df.get("Catagory", "Grocery")).astype(str),
         "lead_time": df.get("Lead_Time", default_lead_time),
@@ -69,47 +112,62 @@ def convert_grocery_csv_to_internal(input_csv: Path, out_dir: Path, default_lead
         "expiration_date": df["Expiration_Date_parsed"].astype("datetime64[ns]").dt.date,
         "current_stock": pd.to_numeric(df.get("Stock_Quantity", 0), errors="coerce").fillna(0).astype(int),
     })
-    products.to_csv(out_dir / "products.csv", index=False)
 
-    # Build transactions.csv with synthetic daily demand matching Sales_Volume
-    rows = []
-    today = dt.date.today()
+
+class _ChunkWriter:
+    """Append DataFrame chunks to a CSV or Parquet file with a fixed column layout."""
+
+    def __init__(self, path: Path, column_types: dict) -> None:
+        self.path = path
+        self.column_types = column_types
+        self._parquet = None
+        self._schema = None
+        self._wrote = False
+
+    def write(self, frame: pd.DataFrame) -> None:
+        if self.path.suffix == ".parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if self._parquet is None:
+                self._schema = pa.schema(
+                    [(name, pa.type_for_alias(alias)) for name, alias in self.column_types.items()]
+                )
+                self._parquet = pq.ParquetWriter(self.path, self._schema, compression="zstd")
+            self._parquet.write_table(pa.Table.from_pandas(frame, schema=self._schema, preserve_index=False))
+        else:
+            frame.to_csv(self.path, mode="a" if self._wrote else "w", header=not self._wrote, index=False)
+        self._wrote = True
+
+    def close(self) -> None:
+        if not self._wrote:
+            # Leave a header-only file so downstream loaders don't fail
+            self.write(pd.DataFrame({name: pd.Series(dtype=object) for name in self.column_types}))
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def convert_grocery_csv_to_internal(
+    input_csv: Path,
+    out_dir: Path,
+    default_lead_time: int = 7,
+    file_format: str = "csv",
+    chunksize: int = 50_000,
+) -> None:
+    """Convert ``input_csv`` in chunks so memory stays bounded by ``chunksize`` rows."""
+    if file_format not in ("csv", "parquet"):
+        raise ValueError(f"Unknown file format {file_format}")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    products_out = _ChunkWriter(out_dir / f"products.{file_format}", PRODUCT_OUTPUT_SCHEMA)
+    tx_out = _ChunkWriter(out_dir / f"transactions.{file_format}", TRANSACTION_OUTPUT_SCHEMA)
+    # Synthetic daily demand matching Sales_Volume; one generator across chunks
     rng = np.random.default_rng(42)
-    for _, r in df.iterrows():
-        pid = str(r["Product_ID"])
-        cat = str(r.get("Category", r.get("Catagory", "Grocery")))
-        start = r.get("Date_Received_parsed") or (today - dt.timedelta(days=90))
-        end = r.get("Last_Order_Date_parsed") or today
-        if start > end:
-            start, end = end, start
-        dates = pd.date_range(start=start, end=end, freq="D")
-        total_sales = int(pd.to_numeric(r.get("Sales_Volume", 0), errors="coerce") or 0)
-        if len(dates) == 0 or total_sales <= 0:
-            continue
-        # Weekday profile (more sales on weekends for grocery?)
-        weekday = np.array([d.weekday() for d in dates])
-        base = np.ones(len(dates))
-        base += np.where(weekday >= 5, 0.3, 0.0)  # Sat/Sun +30%
-        base = base / base.sum()
-        # Allocate integer sales across days
-        alloc = np.floor(base * total_sales).astype(int)
-        remainder = total_sales - int(alloc.sum())
-        if remainder > 0:
-            idxs = rng.choice(len(dates), size=remainder, replace=True)
-            for i in idxs:
-                alloc[i] += 1
-        for d, q in zip(dates, alloc):
-            if q <= 0:
-                continue
-            rows.append({
-                "date": d.date().isoformat(),
-                "product_id": pid,
-                "category": cat,
-                "sales": int(q),
-            })
-    tx = pd.DataFrame(rows)
-    if not tx.empty:
-        tx.to_csv(out_dir / "transactions.csv", index=False)
-    else:
-        # create minimal empty file to avoid errors downstream
-        pd.DataFrame(columns=["date", "product_id", "category", "sales"]).to_csv(out_dir / "transactions.csv", index=False)
+    try:
+        for chunk in pd.read_csv(input_csv, chunksize=chunksize):
+            df = _normalize_columns(chunk)
+            products = _build_products(df, default_lead_time)
+            products_out.write(products)
+            tx_out.write(_build_transactions(df, products, rng))
+    finally:
+        products_out.close()
+        tx_out.close()
@@ -1,12 +1,18 @@
 """Analytical utilities for ABC classification and velocity metrics."""
 from __future__ import annotations
 
+from typing import Tuple
+
 import pandas as pd
 import numpy as np
 
 
+ABC_CLASSES = ["A", "B", "C"]
+VELOCITY_LABELS = ["slow", "fast"]
+
+
 def compute_revenue(products: pd.DataFrame, daily: pd.DataFrame) -> pd.DataFrame:
-    total_sales = daily.groupby("product_id", as_index=False)["sales"].sum()
+    total_sales = daily.groupby("product_id", as_index=False, sort=False, observed=True)["sales"].sum()
     merged = products.merge(total_sales, on="product_id", how="left").fillna({"sales": 0})
     merged["annual_revenue"] = merged["sales"] * merged["unit_cost"]
     return merged
@@ -16,51 +22,154 @@ def abc_classification(df: pd.DataFrame, value_col: str = "annual_revenue") -> p
     ordered = df.sort_values(value_col, ascending=False).reset_index(drop=True)
     total = ordered[value_col].sum() or 1.0
     ordered["cum_pct"] = ordered[value_col].cumsum() / total
+    # A up to 80% of cumulative value, B up to 95%, C for the rest
+    codes = np.searchsorted([0.8, 0.95], ordered["cum_pct"].to_numpy(), side="left")
+    ordered["abc_class"] = pd.Categorical.from_codes(codes, categories=ABC_CLASSES)
+    return ordered
 
-    def label(x: float) -> str:
-        if x <= 0.8:
-            return "A"
-        if x <= 0.95:
-            return "B"
-        return "C"
 
-    ordered["abc_class"] = ordered["cum_pct"].apply(label)
-    return ordered
+def _product_layout(daily: pd.DataFrame):
+    """Per-row group codes and positions plus per-group lengths and ids."""
+    grouped = daily.groupby("product_id", sort=False, observed=True)
+    codes = grouped.ngroup().to_numpy()
+    position = grouped.cumcount().to_numpy()
+    sizes = grouped.size()
+    return codes, position, sizes.to_numpy(), sizes.index.to_numpy()
 
 
-def flag_velocity(daily: pd.DataFrame, window: int = 30, threshold: float = 1.3) -> pd.DataFrame:
-    records = []
-    for pid, subset in daily.groupby("product_id"):
-        subset = subset.sort_values("date").set_index("date")
-        rolling = subset["sales"].rolling(window=window, min_periods=1).mean()
-        overall = subset["sales"].mean() or 0.0
-        speed_ratio = (rolling.iloc[-1] / overall) if overall > 0 else 0.0
-        label = "fast" if speed_ratio >= threshold else "slow"
-        records.append({"product_id": pid, "speed_ratio": speed_ratio, "velocity_label": label})
-    return pd.DataFrame(records)
+def _velocity_from_layout(layout, sales: np.ndarray, window: int, threshold: float) -> pd.DataFrame:
+    codes, position, lengths, product_ids = layout
+    n_groups = len(lengths)
+    overall = np.bincount(codes, weights=sales, minlength=n_groups) / np.maximum(lengths, 1)
+    recent_rows = lengths[codes] - position <= window
+    recent = np.bincount(codes[recent_rows], weights=sales[recent_rows], minlength=n_groups) / np.bincount(
+        codes[recent_rows], minlength=n_groups
+    )
+    speed_ratio = np.divide(recent, overall, out=np.zeros(n_groups), where=overall > 0)
+    return pd.DataFrame(
+        {
+            "product_id": product_ids,
+            "speed_ratio": speed_ratio,
+            "velocity_label": pd.Categorical.from_codes(
+                (speed_ratio >= threshold).astype(np.int8), categories=VELOCITY_LABELS
+            ),
+        }
+    )
+
+
+def flag_velocity(
+    daily: pd.DataFrame,
+    window: int = 30,
+    threshold: float = 1.3,
+) -> pd.DataFrame:
+    """Compare each product's recent mean sales with its overall mean."""
+    daily = daily.sort_values(["product_id", "date"])
+    layout = _product_layout(daily)
+    return _velocity_from_layout(layout, daily["sales"].to_numpy(dtype=np.float64), window, threshold)
 
 
 def summarize_category(daily: pd.DataFrame) -> pd.DataFrame:
-    copy = daily.copy()
-    copy["month"] = copy["date"].dt.to_period("M").dt.to_timestamp()
+    # Group on a derived month key; copying every feature column is not needed
+    month = pd.Series(
+        daily["date"].to_numpy(dtype="datetime64[M]"), index=daily.index, name="month"
+    )
     summary = (
-        copy.groupby(["product_id", "month"], as_index=False)["sales"].sum()
+        daily.groupby([daily["product_id"], month], as_index=False, sort=False, observed=True)["sales"]
+        .sum()
         .rename(columns={"sales": "monthly_sales"})
     )
     return summary
 
 
 def estimate_seasonality_strength(series: pd.Series, period: int = 7) -> float:
-    try:
-        from statsmodels.tsa.seasonal import STL
-    except Exception:
+    """Share of variance at the harmonics of ``period``, read off the periodogram."""
+    values = np.asarray(series, dtype=np.float64)
+    if len(values) < period * 2:
         return 0.0
-    if len(series) < period * 2:
+    # Keep the most recent whole cycles so every harmonic lands on an exact FFT bin
+    values = values[len(values) % period:]
+    centered = values - values.mean()
+    n = len(centered)
+    total_power = n * float(np.dot(centered, centered))
+    if total_power <= 0:
         return 0.0
-    stl = STL(series, period=period, robust=True)
-    result = stl.fit()
-    seasonal_var = np.var(result.seasonal)
-    total_var = np.var(series)
-    if total_var <= 0:
-        return 0.0
-    return float(seasonal_var / total_var)
+    power = np.abs(np.fft.rfft(centered)) ** 2
+    cycles = n // period
+    bins = np.arange(1, period // 2 + 1) * cycles
+    # Parseval: interior bins stand for a +/- frequency pair, Nyquist only for one
+    weights = np.where(2 * bins == n, 1.0, 2.0)
+    return float(np.dot(weights, power[bins]) / total_power)
+
+
+def seasonality_strength_by_product(
+    daily: pd.DataFrame,
+    period: int = 7,
+) -> pd.DataFrame:
+    """Vectorized ``estimate_seasonality_strength`` for every product at once.
+
+    ``daily`` must be sorted by product and date. Periodogram power at the
+    harmonics of ``period`` equals the energy of the per-phase sums, so a few
+    bincounts replace one FFT per product.
+    """
+    layout = _product_layout(daily)
+    return _seasonality_from_layout(layout, daily["sales"].to_numpy(dtype=np.float64), period)
+
+
+def _seasonality_from_layout(layout, sales: np.ndarray, period: int) -> pd.DataFrame:
+    codes, position, lengths, product_ids = layout
+    n_groups = len(lengths)
+
+    # Same trimming as the single-series version: most recent whole cycles only
+    trim = lengths % period
+    keep = (position >= trim[codes]) & (lengths >= period * 2)[codes]
+    group = codes[keep]
+    phase = (position[keep] - trim[group]) % period
+    values = sales[keep]
+
+    counts = np.bincount(group, minlength=n_groups)
+    means = np.bincount(group, weights=values, minlength=n_groups) / np.maximum(counts, 1)
+    centered = values - means[group]
+    total = np.bincount(group, weights=centered * centered, minlength=n_groups)
+    phase_sums = np.bincount(
+        group * period + phase, weights=centered, minlength=n_groups * period
+    ).reshape(n_groups, period)
+    seasonal = (phase_sums * phase_sums).sum(axis=1) / np.maximum(counts // period, 1)
+    strength = np.divide(seasonal, total, out=np.zeros(n_groups), where=total > 0)
+    return pd.DataFrame({"product_id": product_ids, "seasonality_strength": strength})
+
+
+def _monthly_from_layout(layout, daily: pd.DataFrame) -> pd.DataFrame:
+    # Rows are sorted by product and date, so each (product, month) is one run
+    codes = layout[0]
+    month = daily["date"].to_numpy(dtype="datetime64[M]")
+    if not len(month):
+        return summarize_category(daily)
+    starts = np.flatnonzero(np.r_[True, (codes[1:] != codes[:-1]) | (month[1:] != month[:-1])])
+    return pd.DataFrame(
+        {
+            "product_id": daily["product_id"].array.take(starts),
+            "month": month[starts].astype("datetime64[s]"),
+            "monthly_sales": np.add.reduceat(daily["sales"].to_numpy(), starts),
+        }
+    )
+
+
+def profile_products(
+    daily: pd.DataFrame,
+    window: int = 30,
+    threshold: float = 1.3,
+    period: int = 7,
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Velocity, seasonality and monthly summary from one pass over ``daily``.
+
+    Equivalent to ``flag_velocity``, ``seasonality_strength_by_product`` and
+    ``summarize_category``, sharing the group codes between them. ``daily``
+    must be sorted by product and date.
+    """
+    layout = _product_layout(daily)
+    sales = daily["sales"].to_numpy(dtype=np.float64)
+    return (
+        _velocity_from_layout(layout, sales, window, threshold),
+        _seasonality_from_layout(layout, sales, period),
+        _monthly_from_layout(layout, daily),
+    )
@@ -2,7 +2,8 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Tuple
+from typing import Dict, List, Tuple
+import numpy as np
 import pandas as pd
 
 
@@ -22,14 +23,71 @@ EXPECTED_TRANSACTION_COLUMNS = {
     "sales",
 }
 
+# Arrow type aliases used by the pyarrow CSV fast path
+PRODUCT_CSV_READ_TYPES = {
+    "product_id": "string",
+    "category": "string",
+}
+
+TRANSACTION_CSV_READ_TYPES = {
+    "date": "timestamp[ns]",
+    "product_id": "string",
+    "category": "string",
+    "sales": "int64",
+}
+
+# Low-cardinality keys stored as pandas categoricals
+CATEGORICAL_COLUMNS = ("product_id", "category")
+
+
+def _read_arrow_table(path: Path, column_types: dict):
+    """Parse ``path`` with pyarrow's multithreaded CSV reader, or return None."""
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except ImportError:
+        return None
+    convert_options = pacsv.ConvertOptions(
+        column_types={name: pa.type_for_alias(alias) for name, alias in column_types.items()},
+        strings_can_be_null=True,
+    )
+    try:
+        return pacsv.read_csv(path, convert_options=convert_options)
+    except pa.ArrowInvalid:
+        # Malformed values: let pandas coerce them instead
+        return None
+
+
+def _check_columns(columns, expected: set, label: str) -> None:
+    missing = expected.difference(columns)
+    if missing:
+        raise ValueError(f"{label} file missing columns: {sorted(missing)}")
+
+
+def _read_table(path: Path, csv_types: dict, expected: set, label: str) -> pd.DataFrame:
+    """Read a CSV or Parquet input table; ``csv_types`` only applies to CSV."""
+    if path.suffix == ".parquet":
+        df = pd.read_parquet(path, engine="pyarrow")
+        _check_columns(df.columns, expected, label)
+        return df
+    table = _read_arrow_table(path, csv_types)
+    if table is None:
+        # Keep keys as strings like the Arrow path, so numeric ids still align
+        key_types = {name: str for name, alias in csv_types.items() if alias == "string"}
+        df = pd.read_csv(path, dtype=key_types)
+        _check_columns(df.columns, expected, label)
+        return df
+    # Validate against the Arrow schema before paying for the conversion
+    _check_columns(table.column_names, expected, label)
+    return table.to_pandas()
+
 
 def load_products(path: Path) -> pd.DataFrame:
     if not path.exists():
         raise FileNotFoundError(f"Products file not found: {path}")
-    df = pd.read_csv(path)
-    missing = EXPECTED_PRODUCT_COLUMNS.difference(df.columns)
-    if missing:
-        raise ValueError(f"Products file missing columns: {sorted(missing)}")
+    df = _read_table(path, PRODUCT_CSV_READ_TYPES, EXPECTED_PRODUCT_COLUMNS, "Products")
+    for col in CATEGORICAL_COLUMNS:
+        df[col] = df[col].astype("category")
     df["lead_time"] = df["lead_time"].fillna(df["lead_time"].median()).astype(int)
     df["reorder_level"] = df["reorder_level"].fillna(df["reorder_level"].median()).astype(int)
     df["initial_stock"] = df["initial_stock"].fillna(df["initial_stock"].median()).astype(int)
@@ -43,25 +101,79 @@ def load_products(path: Path) -> pd.DataFrame:
     return df
 
 
-def load_transactions(path: Path) -> pd.DataFrame:
-    if not path.exists():
-        raise FileNotFoundError(f"Transactions file not found: {path}")
-    df = pd.read_csv(path)
-    missing = EXPECTED_TRANSACTION_COLUMNS.difference(df.columns)
-    if missing:
-        raise ValueError(f"Transactions file missing columns: {sorted(missing)}")
-    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+def _clean_transactions(df: pd.DataFrame) -> pd.DataFrame:
+    if not pd.api.types.is_datetime64_any_dtype(df["date"]):
+        df["date"] = pd.to_datetime(df["date"], errors="coerce")
     df = df.dropna(subset=["date", "product_id"])
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
     df["sales"] = df["sales"].fillna(0).astype(int)
     df = df[df["sales"] >= 0]
     return df
 
 
+def load_transactions(path: Path) -> pd.DataFrame:
+    if not path.exists():
+        raise FileNotFoundError(f"Transactions file not found: {path}")
+    df = _read_table(path, TRANSACTION_CSV_READ_TYPES, EXPECTED_TRANSACTION_COLUMNS, "Transactions")
+    return _clean_transactions(df)
+
+
+def _stream_daily_sales(path: Path, batch_size: int):
+    """Aggregate a Parquet transactions file batch by batch, or return None.
+
+    Only the columns the daily totals need are scanned, and just one batch of
+    raw rows is held in memory at a time.
+    """
+    try:
+        import pyarrow.dataset as pads
+    except ImportError:
+        return None
+    dataset = pads.dataset(path, format="parquet")
+    _check_columns(dataset.schema.names, EXPECTED_TRANSACTION_COLUMNS, "Transactions")
+    columns = ["date", "product_id", "sales"]
+    partials = [
+        aggregate_daily_sales(_clean_transactions(batch.to_pandas()))
+        for batch in dataset.to_batches(columns=columns, batch_size=batch_size)
+    ]
+    if not partials:
+        empty = dataset.schema.empty_table().select(columns).to_pandas()
+        partials = [aggregate_daily_sales(_clean_transactions(empty))]
+    # A product's day can straddle two batches, so sum the partial totals again
+    daily = aggregate_daily_sales(pd.concat(partials, ignore_index=True))
+    daily["product_id"] = daily["product_id"].astype("category")
+    return daily.reset_index(drop=True)
+
+
+def load_daily_sales(path: Path, batch_size: int = 1_000_000) -> pd.DataFrame:
+    """Daily sales per product; Parquet inputs are streamed rather than loaded whole."""
+    if not path.exists():
+        raise FileNotFoundError(f"Transactions file not found: {path}")
+    if path.suffix == ".parquet":
+        daily = _stream_daily_sales(path, batch_size)
+        if daily is not None:
+            return daily
+    return aggregate_daily_sales(load_transactions(path))
+
+
+def align_categories(*frames: pd.DataFrame, columns=CATEGORICAL_COLUMNS) -> None:
+    """Give categorical ``columns`` one shared dtype so joins stay on integer codes."""
+    for col in columns:
+        categories = pd.api.types.union_categoricals(
+            [frame[col] for frame in frames], sort_categories=True
+        ).categories
+        dtype = pd.CategoricalDtype(categories)
+        for frame in frames:
+            frame[col] = frame[col].astype(dtype)
+
+
 def aggregate_daily_sales(transactions: pd.DataFrame) -> pd.DataFrame:
-    df = transactions.copy()
-    df["date"] = pd.to_datetime(df["date"]).dt.normalize()
+    # Group on a normalized date key instead of copying the whole frame
+    date = pd.to_datetime(transactions["date"]).dt.normalize()
+    keys = [transactions["product_id"], date]
     daily = (
-        df.groupby(["product_id", "date"], as_index=False)["sales"]
+        transactions.groupby(keys, as_index=False, sort=False, observed=True)["sales"]
         .sum()
         .sort_values(["product_id", "date"])
     )
@@ -69,26 +181,65 @@ def aggregate_daily_sales(transactions: pd.DataFrame) -> pd.DataFrame:
 
 
 def add_rolling_features(daily: pd.DataFrame, windows=(7, 14, 30)) -> pd.DataFrame:
-    frames = []
-    for pid, subset in daily.groupby("product_id", sort=False):
-        s = subset.sort_values("date").set_index("date")
-        for win in windows:
-            s[f"rolling_{win}"] = (
-                s["sales"].rolling(window=win, min_periods=1).mean()
-            )
-        s["cumulative"] = s["sales"].cumsum()
-        s["lag_1"] = s["sales"].shift(1)
-        s = s.reset_index()
-        s["product_id"] = pid
-        frames.append(s)
-    return pd.concat(frames, ignore_index=True)
+    daily = daily.sort_values(["product_id", "date"]).reset_index(drop=True)
+    try:
+        from .kernels import grouped_rolling_features
+    except ImportError:
+        grouped_rolling_features = None
+    if grouped_rolling_features is not None:
+        return _add_rolling_features_numba(daily, windows, grouped_rolling_features)
+    grouped = daily.groupby("product_id", sort=False, observed=True)["sales"]
+    for win in windows:
+        daily[f"rolling_{win}"] = (
+            grouped.rolling(window=win, min_periods=1).mean().reset_index(level=0, drop=True)
+        )
+    daily["cumulative"] = grouped.cumsum()
+    daily["lag_1"] = grouped.shift(1)
+    return daily
+
+
+def _add_rolling_features_numba(daily: pd.DataFrame, windows, kernel) -> pd.DataFrame:
+    n = len(daily)
+    pids = daily["product_id"]
+    pids = pids.cat.codes.to_numpy() if isinstance(pids.dtype, pd.CategoricalDtype) else pids.to_numpy()
+    boundaries = np.flatnonzero(pids[1:] != pids[:-1]) + 1
+    offsets = np.concatenate(([0], boundaries, [n])).astype(np.int64)
+    sales = daily["sales"].to_numpy(dtype=np.float64)
+    out_rolling = np.empty((len(windows), n))
+    out_cum = np.empty(n)
+    out_lag = np.empty(n)
+    kernel(sales, offsets, np.asarray(windows, dtype=np.int64), out_rolling, out_cum, out_lag)
+    for row, win in enumerate(windows):
+        daily[f"rolling_{win}"] = out_rolling[row]
+    daily["cumulative"] = out_cum.astype(daily["sales"].dtype)
+    daily["lag_1"] = out_lag
+    return daily
+
+
+def product_row_ranges(daily: pd.DataFrame, product_ids: List[str]) -> Dict[str, Tuple[int, int]]:
+    """``(start, end)`` row positions of each product in ``daily``, sorted by product.
+
+    Binary search over the sorted product column, so no per-product scan or
+    grouping is needed. Products that are absent get an empty range.
+    """
+    pids = daily["product_id"]
+    if isinstance(pids.dtype, pd.CategoricalDtype):
+        # sort_values orders categoricals by code, so search the codes
+        keys = pids.cat.codes.to_numpy()
+        targets = pids.cat.categories.get_indexer(product_ids)
+    else:
+        keys = pids.to_numpy()
+        targets = np.asarray(product_ids, dtype=keys.dtype)
+    starts = np.searchsorted(keys, targets, side="left")
+    ends = np.searchsorted(keys, targets, side="right")
+    return {pid: (int(start), int(end)) for pid, start, end in zip(product_ids, starts, ends)}
 
 
 def compute_current_stock(
     products_df: pd.DataFrame,
     transactions_df: pd.DataFrame,
 ) -> pd.DataFrame:
-    totals = transactions_df.groupby("product_id", as_index=False)["sales"].sum()
+    totals = transactions_df.groupby("product_id", as_index=False, sort=False, observed=True)["sales"].sum()
     totals = totals.rename(columns={"sales": "total_sales_to_date"})
     merged = products_df.merge(totals, on="product_id", how="left")
     merged["total_sales_to_date"] = merged["total_sales_to_date"].fillna(0)
@@ -106,10 +257,12 @@ def prepare_datasets(
     transactions_path: Path,
 ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
     products = load_products(products_path)
-    tx = load_transactions(transactions_path)
-    daily = aggregate_daily_sales(tx)
+    daily = load_daily_sales(transactions_path)
+    # Daily rows carry only product_id; category comes from the products table
+    align_categories(products, daily, columns=("product_id",))
     daily_features = add_rolling_features(daily)
-    inventory = compute_current_stock(products, tx)
+    # Per-product totals over daily sales equal those over raw transactions
+    inventory = compute_current_stock(products, daily)
     return products, daily_features, inventory
 
 
@@ -0,0 +1,34 @@
+"""Optional Numba kernels for hot numeric loops.
+
+Importing this module requires numba; callers fall back to pandas when it is
+not installed.
+"""
+from __future__ import annotations
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(parallel=True, cache=True)
+def grouped_rolling_features(sales, offsets, windows, out_rolling, out_cum, out_lag):
+    """Fill rolling means, running totals and lag-1 values per product.
+
+    ``sales`` must be sorted so product ``g`` occupies ``offsets[g]:offsets[g + 1]``.
+    ``out_rolling`` has one row per entry in ``windows``.
+    """
+    for g in prange(len(offsets) - 1):
+        start = offsets[g]
+        end = offsets[g + 1]
+        total = 0.0
+        for i in range(start, end):
+            total += sales[i]
+            out_cum[i] = total
+            out_lag[i] = sales[i - 1] if i > start else np.nan
+        for w in range(len(windows)):
+            win = windows[w]
+            acc = 0.0
+            for i in range(start, end):
+                acc += sales[i]
+                if i - start >= win:
+                    acc -= sales[i - win]
+                out_rolling[w, i] = acc / min(i - start + 1, win)
@@ -3,11 +3,14 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
 import datetime as dt
+import functools
+import logging
+import os
 
 
 @dataclass
@@ -23,9 +26,21 @@ def prepare_prophet_frame(series: pd.DataFrame) -> pd.DataFrame:
     return frame
 
 
-def run_prophet(series: pd.DataFrame, horizon_days: int = 30) -> pd.DataFrame:
+@functools.lru_cache(maxsize=None)
+def _load_prophet():
+    """Import Prophet once per process and silence its per-fit logging."""
     from prophet import Prophet
 
+    for name in ("cmdstanpy", "prophet"):
+        logger = logging.getLogger(name)
+        # A handler stops cmdstanpy from installing its own INFO stream handler
+        logger.addHandler(logging.NullHandler())
+        logger.setLevel(logging.WARNING)
+    return Prophet
+
+
+def run_prophet(series: pd.DataFrame, horizon_days: int = 30) -> pd.DataFrame:
+    Prophet = _load_prophet()
     frame = prepare_prophet_frame(series)
     model = Prophet()
     model.fit(frame)
@@ -42,45 +57,87 @@ def run_lstm_stub(series: pd.DataFrame, horizon_days: int = 30) -> pd.DataFrame:
     return pd.DataFrame({"ds": dates, "yhat": prediction})
 
 
+def _fit_one(
+    product_id: str,
+    subset: pd.DataFrame,
+    horizon_days: int,
+    model_name: str,
+) -> ForecastResult:
+    if model_name == "prophet":
+        forecast = run_prophet(subset, horizon_days=horizon_days)
+    elif model_name == "lstm_stub":
+        forecast = run_lstm_stub(subset, horizon_days=horizon_days)
+    else:
+        raise ValueError(f"Unknown model {model_name}")
+    future = forecast.tail(horizon_days)
+    total = float(future["yhat"].sum())
+    return ForecastResult(product_id=product_id, forecast_df=forecast, total_demand_30=total)
+
+
 def forecast_per_product(
     daily: pd.DataFrame,
     product_ids: List[str],
     horizon_days: int,
     model_name: str,
+    n_jobs: int = -1,
+    row_ranges: Optional[Dict[str, Tuple[int, int]]] = None,
 ) -> List[ForecastResult]:
-    results: List[ForecastResult] = []
+    """Forecast each of ``product_ids`` from its rows in ``daily``.
+
+    ``row_ranges`` maps products to contiguous ``(start, end)`` row positions
+    (see ``data_processing.product_row_ranges``); without it the rows are
+    found by grouping ``daily``.
+    """
+    if model_name not in ("prophet", "lstm_stub"):
+        raise ValueError(f"Unknown model {model_name}")
+    series = daily[["date", "sales"]]
+    if row_ranges is not None:
+        subsets = {pid: series.iloc[start:end] for pid, (start, end) in row_ranges.items()}
+    else:
+        indices = daily.groupby("product_id", sort=False, observed=True).indices
+        subsets = {pid: series.iloc[indices[pid]] for pid in product_ids if pid in indices}
+    tasks = []
     for pid in product_ids:
-        subset = daily[daily["product_id"] == pid][["date", "sales"]]
-        if len(subset) < 5:
+        subset = subsets.get(pid)
+        if subset is None or len(subset) < 5:
             continue
-        if model_name == "prophet":
-            forecast = run_prophet(subset, horizon_days=horizon_days)
-        elif model_name == "lstm_stub":
-            forecast = run_lstm_stub(subset, horizon_days=horizon_days)
+        tasks.append((pid, subset))
+    # Prophet fits are CPU-bound and independent per product; the stub is too
+    # cheap to be worth shipping to worker processes.
+    if model_name == "prophet" and n_jobs != 1 and len(tasks) > 1:
+        try:
+            from joblib import Parallel, delayed, effective_n_jobs
+        except ImportError:
+            pass
         else:
-            raise ValueError(f"Unknown model {model_name}")
-        future = forecast.tail(horizon_days)
-        total = float(future["yhat"].sum())
-        results.append(ForecastResult(product_id=pid, forecast_df=forecast, total_demand_30=total))
-    return results
+            # No point starting more workers than there are series to fit
+            workers = min(len(tasks), effective_n_jobs(n_jobs))
+            return Parallel(n_jobs=workers, backend="loky")(
+                delayed(_fit_one)(pid, subset, horizon_days, model_name) for pid, subset in tasks
+            )
+    return [_fit_one(pid, subset, horizon_days, model_name) for pid, subset in tasks]
 
 
 def _compute_next_order_date(
     current_stock: float,
     reorder_level: float,
     lead_time: int,
-    future_df: pd.DataFrame,
+    yhat: np.ndarray,
+    ds: np.ndarray,
 ) -> Optional[dt.date]:
     today = dt.date.today()
-    fut = future_df[["ds", "yhat"]].copy().reset_index(drop=True)
-    fut["cum"] = fut["yhat"].clip(lower=0).cumsum()
-    mask = (current_stock - fut["cum"]) <= reorder_level
+    cum = np.cumsum(np.clip(yhat, 0, None))
+    mask = (current_stock - cum) <= reorder_level
     if not mask.any():
         return None
-    first_idx = int(np.argmax(mask.values))
-    hit_date = pd.to_datetime(fut.loc[first_idx, "ds"]).date()
-    order_date = hit_date - dt.timedelta(days=int(lead_time))
-    return max(today, order_date)
+    order_date = ds[mask.argmax()] - np.timedelta64(int(lead_time), "D")
+    return max(today, order_date.astype(dt.date))
+
+
+def _column_or(frame: pd.DataFrame, name: str, default: float) -> np.ndarray:
+    if name in frame:
+        return frame[name].to_numpy()
+    return np.full(len(frame), default)
 
 
 def suggest_reorder(
@@ -89,85 +146,104 @@ def suggest_reorder(
     horizon_days: int,
     safety_factor: float = 1.2,
 ) -> pd.DataFrame:
+    # Later forecasts for the same product win, as with a dict lookup
     forecast_map: Dict[str, ForecastResult] = {f.product_id: f for f in forecasts}
-    rows = []
-    for _, row in inventory.iterrows():
-        pid = row["product_id"]
-        forecast = forecast_map.get(pid)
-        if forecast is None:
-            continue
-        lead_time = max(int(row.get("lead_time", 7)), 1)
-        current_stock = float(row.get("current_stock", 0))
-        reorder_level = float(row.get("reorder_level", 0))
-        # Future horizon window (assume tail is future)
-        fut = forecast.forecast_df.tail(horizon_days)
-        demand_during_lead = float(fut.head(lead_time)["yhat"].clip(lower=0).sum())
-
-        # Perishable logic: limit effective demand by time until expiration
-        expiration_date = row.get("expiration_date", None)
-        sale_window_days: Optional[int] = None
-        if pd.notna(expiration_date):
-            try:
-                exp = expiration_date if isinstance(expiration_date, dt.date) else pd.to_datetime(expiration_date).date()
-                sale_window_days = max(0, (exp - dt.date.today()).days)
-            except Exception:
-                sale_window_days = None
-        if sale_window_days is not None:
-            effective_days = max(0, min(lead_time, sale_window_days))
-            demand_during_lead = float(fut.head(effective_days)["yhat"].clip(lower=0).sum())
-
-        reorder_qty = max(0, int(round(demand_during_lead * safety_factor - current_stock)))
-        needs_reorder = (current_stock - demand_during_lead) < reorder_level
-
-        next_order_date = _compute_next_order_date(
-            current_stock=current_stock,
-            reorder_level=reorder_level,
-            lead_time=lead_time,
-            future_df=fut,
+    if not forecast_map:
+        return pd.DataFrame()
+    # Future horizon window (assume tail is future), padded into one matrix with
+    # a leading zero column so cum_demand[i, k] is the demand over the first k days
+    yhats = [f.forecast_df["yhat"].to_numpy(dtype=np.float64)[-horizon_days:] for f in forecast_map.values()]
+    dss = [f.forecast_df["ds"].to_numpy(dtype="datetime64[D]")[-horizon_days:] for f in forecast_map.values()]
+    width = max(len(y) for y in yhats)
+    cum_demand = np.zeros((len(yhats), width + 1))
+    for i, yhat in enumerate(yhats):
+        cum_demand[i, 1 : len(yhat) + 1] = np.cumsum(np.clip(yhat, 0, None))
+        cum_demand[i, len(yhat) + 1 :] = cum_demand[i, len(yhat)]
+
+    fc_index = pd.DataFrame({"product_id": list(forecast_map), "_fc_idx": np.arange(len(forecast_map))})
+    merged = inventory.merge(fc_index, on="product_id", how="inner")
+    idx = merged["_fc_idx"].to_numpy()
+    lead_time = np.maximum(_column_or(merged, "lead_time", 7).astype(int), 1)
+    current_stock = _column_or(merged, "current_stock", 0).astype(float)
+    reorder_level = _column_or(merged, "reorder_level", 0).astype(float)
+
+    # Perishable logic: limit effective demand by time until expiration
+    if "expiration_date" in merged:
+        expiration = pd.to_datetime(merged["expiration_date"], errors="coerce").dt.normalize()
+        sale_window = (expiration - pd.Timestamp(dt.date.today())).dt.days.clip(lower=0).to_numpy()
+    else:
+        sale_window = np.full(len(merged), np.nan)
+    has_window = ~np.isnan(sale_window)
+    sale_days = np.nan_to_num(sale_window).astype(int)
+    effective_days = np.where(has_window, np.minimum(lead_time, sale_days), lead_time)
+    demand_during_lead = cum_demand[idx, np.minimum(effective_days, width)]
+
+    reorder_qty = np.maximum(0, np.round(demand_during_lead * safety_factor - current_stock)).astype(int)
+    needs_reorder = (current_stock - demand_during_lead) < reorder_level
+
+    next_order_date = [
+        _compute_next_order_date(
+            current_stock=current_stock[i],
+            reorder_level=reorder_level[i],
+            lead_time=lead_time[i],
+            yhat=yhats[idx[i]],
+            ds=dss[idx[i]],
         )
+        for i in range(len(merged))
+    ]
+
+    waste = np.maximum(0.0, current_stock - cum_demand[idx, np.minimum(sale_days, width)])
+    waste_estimate = np.where(has_window & (sale_days > 0), waste, np.nan)
+    return pd.DataFrame(
+        {
+            "product_id": merged["product_id"].to_numpy(),
+            "lead_time": lead_time,
+            "current_stock": current_stock,
+            "projected_demand_lead_time": demand_during_lead,
+            "reorder_level": reorder_level,
+            "recommended_reorder_qty": reorder_qty,
+            "needs_reorder": needs_reorder,
+            "next_order_date": next_order_date,
+            "waste_estimate": waste_estimate,
+        }
+    )
+
+
+def plot_forecast(result: ForecastResult, out_dir: Union[str, Path]) -> Path:
+    import matplotlib.pyplot as plt
 
-        waste_estimate = None
-        if sale_window_days and sale_window_days > 0:
-            demand_until_exp = float(fut.head(sale_window_days)["yhat"].clip(lower=0).sum())
-            waste_estimate = max(0.0, current_stock - demand_until_exp)
-        rows.append(
-            {
-                "product_id": pid,
-                "lead_time": lead_time,
-                "current_stock": current_stock,
-                "projected_demand_lead_time": demand_during_lead,
-                "reorder_level": reorder_level,
-                "recommended_reorder_qty": reorder_qty,
-                "needs_reorder": bool(needs_reorder),
-                "next_order_date": next_order_date,
-                "waste_estimate": waste_estimate,
-            }
+    from .visualization import SAVEFIG_KWARGS
+
+    plt.figure(figsize=(9, 4))
+    plt.plot(result.forecast_df["ds"], result.forecast_df["yhat"], label="Forecast")
+    if "yhat_lower" in result.forecast_df.columns:
+        plt.fill_between(
+            result.forecast_df["ds"],
+            result.forecast_df["yhat_lower"],
+            result.forecast_df["yhat_upper"],
+            color="lightblue",
+            alpha=0.4,
         )
-    return pd.DataFrame(rows)
+    plt.title(f"Forecast for {result.product_id}")
+    plt.xlabel("Date")
+    plt.ylabel("Units")
+    plt.legend()
+    plt.tight_layout()
+    path = os.path.join(out_dir, f"forecast_{result.product_id}.png")
+    plt.savefig(path, **SAVEFIG_KWARGS)
+    plt.close()
+    return Path(path)
 
 
 def save_forecast_plots(
     forecasts: List[ForecastResult],
     out_dir: Path,
+    max_workers: Optional[int] = None,
 ) -> None:
-    import matplotlib.pyplot as plt
+    from .visualization import render_plots
 
     out_dir.mkdir(parents=True, exist_ok=True)
-    for result in forecasts:
-        plt.figure(figsize=(9, 4))
-        plt.plot(result.forecast_df["ds"], result.forecast_df["yhat"], label="Forecast")
-        if "yhat_lower" in result.forecast_df.columns:
-            plt.fill_between(
-                result.forecast_df["ds"],
-                result.forecast_df["yhat_lower"],
-                result.forecast_df["yhat_upper"],
-                color="lightblue",
-                alpha=0.4,
-            )
-        plt.title(f"Forecast for {result.product_id}")
-        plt.xlabel("Date")
-        plt.ylabel("Units")
-        plt.legend()
-        plt.tight_layout()
-        plt.savefig(out_dir / f"forecast_{result.product_id}.png")
-        plt.close()
+    render_plots(
+        [(plot_forecast, {"result": result, "out_dir": str(out_dir)}) for result in forecasts],
+        max_workers=max_workers,
+    )
@@ -1,9 +1,10 @@
 """High-level orchestration pipeline for inventory analysis and forecasting."""
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import pandas as pd
 
@@ -23,34 +24,75 @@ class PipelineOutputs:
     plots: Dict[str, Path]
 
 
+OUTPUT_FORMATS = ("csv", "feather")
+
+
+def _write_table(frame: pd.DataFrame, path: Path) -> None:
+    if path.suffix == ".feather":
+        # Arrow IPC keeps dtypes (categoricals, dates) and skips text formatting
+        frame.to_feather(path, compression="lz4")
+        return
+    frame.to_csv(path, index=False)
+
+
+def _render_plots(
+    plot_dir: Path,
+    inventory: pd.DataFrame,
+    abc: pd.DataFrame,
+    monthly: pd.DataFrame,
+    forecasts: List[model.ForecastResult],
+    monthly_products: List[str],
+    max_workers: Optional[int] = None,
+) -> Dict[str, Path]:
+    plot_dir.mkdir(parents=True, exist_ok=True)
+    out_dir = str(plot_dir)
+    # The scatter only reads stock, sales and category, all already on inventory
+    named_tasks: Dict[str, visualization.PlotTask] = {
+        "stock_vs_sales": (visualization.plot_stock_vs_sales, {"inventory": inventory, "out_dir": out_dir}),
+        "abc_pie": (visualization.plot_abc_pie, {"abc_df": abc, "out_dir": out_dir}),
+    }
+    # monthly is sorted by product, so binary-search the few plotted products
+    # instead of grouping or scanning the whole table
+    monthly_ranges = data_processing.product_row_ranges(monthly, monthly_products)
+    for product_id, (start, end) in monthly_ranges.items():
+        if start == end:
+            continue
+        subset = monthly.iloc[start:end]
+        named_tasks[f"monthly_{product_id}"] = (
+            visualization.plot_monthly_trend,
+            {"subset": subset, "product_id": product_id, "out_dir": out_dir},
+        )
+    forecast_tasks = [(model.plot_forecast, {"result": f, "out_dir": out_dir}) for f in forecasts]
+    # One batch for every figure so a worker pool, if any, starts only once
+    paths = visualization.render_plots(list(named_tasks.values()) + forecast_tasks, max_workers=max_workers)
+    return dict(zip(named_tasks, paths))
+
+
 def run_pipeline(
     data_dir: Path,
     output_dir: Path,
     model_name: str = "prophet",
     horizon_days: int = 30,
     plot_examples: int = 3,
+    data_format: str = "csv",
+    output_format: str = "csv",
+    plot_workers: Optional[int] = None,
 ) -> PipelineOutputs:
-    products_path = data_dir / "products.csv"
-    transactions_path = data_dir / "transactions.csv"
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format {output_format}")
+    products_path = data_dir / f"products.{data_format}"
+    transactions_path = data_dir / f"transactions.{data_format}"
 
     products, daily_features, inventory = data_processing.prepare_datasets(
         products_path=products_path,
         transactions_path=transactions_path,
     )
 
+    # daily_features comes out of prepare_datasets sorted by product and date,
+    # which profile_products and the row-range lookup below rely on
     revenue = analysis.compute_revenue(products, daily_features)
     abc = analysis.abc_classification(revenue)
-    velocity = analysis.flag_velocity(daily_features)
-    seasonality_records = []
-    for pid, subset in daily_features.groupby("product_id"):
-        strength = analysis.estimate_seasonality_strength(
-            subset.sort_values("date")["sales"]
-        )
-        seasonality_records.append(
-            {"product_id": pid, "seasonality_strength": strength}
-        )
-    seasonality_df = pd.DataFrame(seasonality_records)
-    monthly = analysis.summarize_category(daily_features)
+    velocity, seasonality_df, monthly = analysis.profile_products(daily_features)
 
     focus_products = abc["product_id"].head(20).tolist()
     forecasts = model.forecast_per_product(
@@ -58,6 +100,7 @@ def run_pipeline(
         product_ids=focus_products,
         horizon_days=horizon_days,
         model_name=model_name,
+        row_ranges=data_processing.product_row_ranges(daily_features, focus_products),
     )
 
     reorder = model.suggest_reorder(
@@ -66,35 +109,30 @@ def run_pipeline(
         horizon_days=horizon_days,
     )
 
-    plot_dir = output_dir / "plots"
-    inventory_stats = inventory.merge(
-        revenue[["product_id", "annual_revenue"]],
-        on="product_id",
-        how="left",
-    )
-
+    # plot_examples=0 skips plotting altogether, so matplotlib is never loaded
     plots: Dict[str, Path] = {}
-    plots["stock_vs_sales"] = visualization.plot_stock_vs_sales(
-        inventory=inventory_stats,
-        out_dir=plot_dir,
-    )
-    plots["abc_pie"] = visualization.plot_abc_pie(abc_df=abc, out_dir=plot_dir)
-    for product_id in focus_products[:plot_examples]:
-        try:
-            plots[f"monthly_{product_id}"] = visualization.plot_monthly_trend(
-                monthly=monthly,
-                product_id=product_id,
-                out_dir=plot_dir,
-            )
-        except ValueError:
-            continue
-    model.save_forecast_plots(forecasts=forecasts, out_dir=plot_dir)
+    if plot_examples > 0:
+        plots = _render_plots(
+            plot_dir=output_dir / "plots",
+            inventory=inventory,
+            abc=abc,
+            monthly=monthly,
+            forecasts=forecasts,
+            monthly_products=focus_products[:plot_examples],
+            max_workers=plot_workers,
+        )
 
     output_dir.mkdir(parents=True, exist_ok=True)
-    abc.to_csv(output_dir / "abc_classification.csv", index=False)
-    velocity.to_csv(output_dir / "velocity_metrics.csv", index=False)
-    seasonality_df.to_csv(output_dir / "seasonality_strength.csv", index=False)
-    reorder.to_csv(output_dir / "reorder_recommendations.csv", index=False)
+    outputs = {
+        "abc_classification": abc,
+        "velocity_metrics": velocity,
+        "seasonality_strength": seasonality_df,
+        "reorder_recommendations": reorder,
+    }
+    paths = [output_dir / f"{name}.{output_format}" for name in outputs]
+    # Writes are independent and release the GIL in pyarrow, so overlap them
+    with ThreadPoolExecutor(max_workers=len(outputs)) as executor:
+        list(executor.map(_write_table, outputs.values(), paths))
 
     return PipelineOutputs(
         products=products,
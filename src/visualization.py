@@ -1,55 +1,174 @@
-"""Visualization helpers for analysis outputs."""
+"""Visualization helpers for analysis outputs.
+
+The ``plot_*`` functions expect ``out_dir`` to exist; callers create it once.
+"""
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-import matplotlib.pyplot as plt
-import seaborn as sns
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
+import ast
+import functools
+import multiprocessing
+import os
+import sys
+import threading
+
+import numpy as np
 import pandas as pd
 
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+
+PlotTask = Tuple[Callable[..., Path], Dict[str, Any]]
+# Plot tasks take output directories as plain str: cheaper to join and to pickle
+PathLike = Union[str, Path]
+
+# Pipeline PNGs favour encode speed over size: fast zlib level, slightly lower dpi
+SAVEFIG_KWARGS: Dict[str, Any] = {"dpi": 90, "pil_kwargs": {"compress_level": 1, "optimize": False}}
+
+# One canvas per process, reused by every plot_* call; pyplot state is not
+# thread-safe, so the lock serializes callers within a process
+_FIGURE: Optional[Figure] = None
+_FIGURE_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def _load_matplotlib() -> None:
+    """Import matplotlib on first use rather than with the module."""
+    import matplotlib
+    import matplotlib.style
+
+    # Plots are only ever written to files; Agg avoids GUI backend setup
+    matplotlib.use("Agg")
+    # matplotlib's copy of seaborn's whitegrid look, without importing seaborn;
+    # white patch edges keep the pie wedges separated as before
+    matplotlib.style.use("seaborn-v0_8-whitegrid")
+    matplotlib.rcParams.update({"patch.edgecolor": "w", "patch.force_edgecolor": True})
+
+
+def _get_figure() -> Figure:
+    global _FIGURE
+    if _FIGURE is None:
+        _load_matplotlib()
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        _FIGURE = Figure()
+        FigureCanvasAgg(_FIGURE)
+    return _FIGURE
+
+
+@contextmanager
+def _reused_axes(figsize: Tuple[float, float]):
+    with _FIGURE_LOCK:
+        fig = _get_figure()
+        fig.clf()
+        fig.set_size_inches(figsize)
+        yield fig, fig.add_subplot()
+
+
+def _warm_up_worker() -> None:
+    # Pay font cache and canvas setup once per worker rather than per plot
+    _get_figure().canvas.get_renderer()
+
+
+def _render(task: PlotTask) -> Path:
+    fn, kwargs = task
+    return fn(**kwargs)
+
+
+def _is_main_guard(test: ast.expr) -> bool:
+    if not (isinstance(test, ast.Compare) and len(test.ops) == 1 and isinstance(test.ops[0], ast.Eq)):
+        return False
+    return {ast.unparse(test.left), ast.unparse(test.comparators[0])} == {"__name__", "'__main__'"}
+
+
+def _main_is_spawn_safe() -> bool:
+    """Whether spawned workers can re-import ``__main__`` without re-running the caller."""
+    path = getattr(sys.modules.get("__main__"), "__file__", None)
+    if path is None:
+        # Interactive sessions and ``python -c``: spawn has no main script to re-run
+        return True
+    try:
+        tree = ast.parse(Path(path).read_text())
+    except (OSError, SyntaxError, UnicodeDecodeError, ValueError):
+        return False
+    return any(isinstance(node, ast.If) and _is_main_guard(node.test) for node in tree.body)
+
+
+def render_plots(tasks: List[PlotTask], max_workers: Optional[int] = None) -> List[Path]:
+    """Run ``(plot_fn, kwargs)`` tasks, in-process unless ``max_workers`` > 1.
+
+    Worker processes re-import the caller's main script, so they are only used
+    when it has an ``if __name__ == "__main__":`` guard. Output directories
+    must exist beforehand; tasks may run in any order.
+    """
+    workers = min(max_workers or 1, os.cpu_count() or 1, len(tasks))
+    # Check before starting the pool: an unguarded script would otherwise re-run
+    # its whole pipeline in every worker before the pool breaks
+    if workers > 1 and _main_is_spawn_safe():
+        # Rendering is CPU-bound and independent per plot. Spawn rather than fork:
+        # forking after numba's TBB threads have started hangs the parent at exit.
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_up_worker,
+        ) as executor:
+            return list(executor.map(_render, tasks))
+    if tasks:
+        _load_matplotlib()
+    return [_render(task) for task in tasks]
+
+
+def plot_stock_vs_sales(inventory: pd.DataFrame, out_dir: PathLike) -> Path:
+    path = os.path.join(out_dir, "stock_vs_sales.png")
+    with _reused_axes((10, 6)) as (fig, ax):
+        categories = inventory["category"].astype("category")
+        codes = categories.cat.codes.to_numpy()
+        stock = inventory["current_stock"].to_numpy()
+        sales = inventory["total_sales_to_date"].to_numpy()
+        # One scatter per category so each gets the next cycle colour and a legend entry
+        for code, name in enumerate(categories.cat.categories):
+            mask = codes == code
+            if mask.any():
+                ax.scatter(stock[mask], sales[mask], label=name, edgecolors="white", linewidths=0.75)
+        ax.legend(title="category")
+        ax.set_title("Current Stock vs Annual Sales")
+        ax.set_xlabel("Current Stock")
+        ax.set_ylabel("Historical Sales")
+        fig.tight_layout()
+        fig.savefig(path, **SAVEFIG_KWARGS)
+    return Path(path)
+
+
+def plot_abc_pie(abc_df: pd.DataFrame, out_dir: PathLike) -> Path:
+    classes = abc_df["abc_class"].astype("category")
+    codes = classes.cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(classes.cat.categories))
+    # Keep classes with no products off the pie
+    present = counts > 0
+    path = os.path.join(out_dir, "abc_distribution.png")
+    with _reused_axes((6, 6)) as (fig, ax):
+        ax.pie(counts[present], labels=classes.cat.categories[present], autopct="%1.1f%%")
+        ax.set_title("ABC Classification Share")
+        fig.savefig(path, **SAVEFIG_KWARGS)
+    return Path(path)
+
 
-sns.set_style("whitegrid")
-
-
-def plot_stock_vs_sales(inventory: pd.DataFrame, out_dir: Path) -> Path:
-    out_dir.mkdir(parents=True, exist_ok=True)
-    plt.figure(figsize=(10, 6))
-    sns.scatterplot(
-        data=inventory,
-        x="current_stock",
-        y="total_sales_to_date",
-        hue="category",
-    )
-    plt.title("Current Stock vs Annual Sales")
-    plt.xlabel("Current Stock")
-    plt.ylabel("Historical Sales")
-    plt.tight_layout()
-    path = out_dir / "stock_vs_sales.png"
-    plt.savefig(path)
-    plt.close()
-    return path
-
-
-def plot_abc_pie(abc_df: pd.DataFrame, out_dir: Path) -> Path:
-    counts = abc_df["abc_class"].value_counts().sort_index()
-    plt.figure(figsize=(6, 6))
-    plt.pie(counts.values, labels=counts.index, autopct="%1.1f%%")
-    plt.title("ABC Classification Share")
-    path = out_dir / "abc_distribution.png"
-    plt.savefig(path)
-    plt.close()
-    return path
-
-
-def plot_monthly_trend(monthly: pd.DataFrame, product_id: str, out_dir: Path) -> Path:
-    subset = monthly[monthly["product_id"] == product_id]
-    if subset.empty:
+def plot_monthly_trend(subset: Optional[pd.DataFrame], product_id: str, out_dir: PathLike) -> Path:
+    """Plot one product's monthly sales; ``subset`` holds only that product's rows."""
+    if subset is None or subset.empty:
         raise ValueError(f"No monthly data for product {product_id}")
-    plt.figure(figsize=(10, 4))
-    sns.lineplot(data=subset, x="month", y="monthly_sales")
-    plt.title(f"Monthly Demand Trend - {product_id}")
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    path = out_dir / f"monthly_trend_{product_id}.png"
-    plt.savefig(path)
-    plt.close()
-    return path
+    path = os.path.join(out_dir, f"monthly_trend_{product_id}.png")
+    with _reused_axes((10, 4)) as (fig, ax):
+        ax.plot(subset["month"].to_numpy(), subset["monthly_sales"].to_numpy())
+        ax.set_xlabel("month")
+        ax.set_ylabel("monthly_sales")
+        ax.set_title(f"Monthly Demand Trend - {product_id}")
+        ax.tick_params(axis="x", labelrotation=45)
+        fig.tight_layout()
+        fig.savefig(path, **SAVEFIG_KWARGS)
+    return Path(path)
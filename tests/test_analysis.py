@@ -0,0 +1,60 @@
+"""Tests for analysis helpers."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from src import analysis
+
+
+def test_seasonality_strength_separates_weekly_signal_from_noise() -> None:
+    days = np.arange(91)
+    weekly = pd.Series(10 + 3 * np.sin(2 * np.pi * days / 7))
+    noise = pd.Series(np.random.default_rng(0).normal(10, 2, size=91))
+
+    assert analysis.estimate_seasonality_strength(weekly) > 0.99
+    assert analysis.estimate_seasonality_strength(noise) < 0.1
+    assert analysis.estimate_seasonality_strength(pd.Series(np.full(91, 3.0))) == 0.0
+    assert analysis.estimate_seasonality_strength(weekly.head(10)) == 0.0
+
+
+def test_batched_seasonality_matches_single_series() -> None:
+    rng = np.random.default_rng(1)
+    frames = []
+    for idx, length in enumerate([5, 14, 20, 91]):
+        sales = rng.integers(0, 20, size=length) + 4 * np.sin(2 * np.pi * np.arange(length) / 7)
+        frames.append(
+            pd.DataFrame(
+                {
+                    "product_id": f"P{idx}",
+                    "date": pd.date_range("2024-01-01", periods=length),
+                    "sales": sales,
+                }
+            )
+        )
+    daily = pd.concat(frames, ignore_index=True)
+
+    batched = analysis.seasonality_strength_by_product(daily)
+
+    expected = [analysis.estimate_seasonality_strength(frame["sales"]) for frame in frames]
+    assert batched["product_id"].tolist() == ["P0", "P1", "P2", "P3"]
+    np.testing.assert_allclose(batched["seasonality_strength"], expected, atol=1e-12)
+
+
+def test_profile_products_matches_separate_analyses() -> None:
+    rng = np.random.default_rng(2)
+    daily = pd.DataFrame(
+        {
+            "product_id": pd.Categorical(np.repeat(["A", "B", "C"], [40, 75, 3])),
+            "date": np.concatenate(
+                [pd.date_range("2024-01-20", periods=n).to_numpy() for n in (40, 75, 3)]
+            ),
+            "sales": rng.integers(0, 30, size=118),
+        }
+    )
+
+    velocity, seasonality, monthly = analysis.profile_products(daily)
+
+    pd.testing.assert_frame_equal(velocity, analysis.flag_velocity(daily))
+    pd.testing.assert_frame_equal(seasonality, analysis.seasonality_strength_by_product(daily))
+    pd.testing.assert_frame_equal(monthly, analysis.summarize_category(daily))
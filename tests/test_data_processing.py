@@ -0,0 +1,101 @@
+"""Tests for data processing feature builders."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import data_processing
+
+
+def test_numba_rolling_features_match_pandas() -> None:
+    kernels = pytest.importorskip("src.kernels")
+    rng = np.random.default_rng(0)
+    daily = pd.DataFrame(
+        {
+            "product_id": np.repeat(["P2", "P1", "P3"], [40, 3, 25]),
+            "date": np.concatenate(
+                [pd.date_range("2024-01-01", periods=k).to_numpy() for k in (40, 3, 25)]
+            ),
+            "sales": rng.integers(0, 30, size=68),
+        }
+    )
+
+    result = data_processing._add_rolling_features_numba(
+        daily.sort_values(["product_id", "date"]).reset_index(drop=True),
+        (7, 30),
+        kernels.grouped_rolling_features,
+    )
+
+    grouped = result.groupby("product_id", sort=False)["sales"]
+    for win in (7, 30):
+        expected = grouped.rolling(window=win, min_periods=1).mean().reset_index(level=0, drop=True)
+        np.testing.assert_allclose(result[f"rolling_{win}"], expected)
+    np.testing.assert_array_equal(result["cumulative"], grouped.cumsum())
+    np.testing.assert_array_equal(result["lag_1"], grouped.shift(1))
+
+
+def test_streamed_daily_sales_match_in_memory_aggregation(tmp_path: Path) -> None:
+    pytest.importorskip("pyarrow")
+    rng = np.random.default_rng(1)
+    # Several rows per product and day so partial sums straddle batch edges
+    tx = pd.DataFrame(
+        {
+            "date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 20, size=300), unit="D"),
+            "product_id": rng.choice(["P1", "P2", "P3"], size=300),
+            "category": "Grocery",
+            "sales": rng.integers(0, 10, size=300),
+        }
+    )
+    path = tmp_path / "transactions.parquet"
+    tx.to_parquet(path, index=False)
+
+    streamed = data_processing.load_daily_sales(path, batch_size=37)
+
+    expected = data_processing.aggregate_daily_sales(data_processing.load_transactions(path))
+    pd.testing.assert_frame_equal(streamed, expected.reset_index(drop=True), check_categorical=False)
+
+
+def test_product_row_ranges_follow_sorted_products() -> None:
+    daily = pd.DataFrame({"product_id": pd.Categorical(["P1", "P1", "P2", "P4", "P4", "P4"])})
+
+    ranges = data_processing.product_row_ranges(daily, ["P4", "P1", "P3"])
+
+    assert ranges["P4"] == (3, 6)
+    assert ranges["P1"] == (0, 2)
+    start, end = ranges["P3"]
+    assert start == end
+    plain = data_processing.product_row_ranges(daily.astype({"product_id": str}), ["P4", "P3"])
+    assert plain == {"P4": (3, 6), "P3": (3, 3)}
+
+
+def test_pandas_fallback_keeps_numeric_ids_as_strings(tmp_path: Path) -> None:
+    pd.DataFrame(
+        {
+            "product_id": [101, 102],
+            "category": [1, 2],
+            "lead_time": [3, 4],
+            "reorder_level": [5, 6],
+            "initial_stock": [50, 60],
+            "unit_cost": [1.5, 2.5],
+        }
+    ).to_csv(tmp_path / "products.csv", index=False)
+    # The malformed date makes the Arrow reader give up and pandas take over
+    pd.DataFrame(
+        {
+            "date": ["2024-01-01", "not a date", "2024-01-02"],
+            "product_id": [101, 102, 102],
+            "category": [1, 2, 2],
+            "sales": [3, 4, 5],
+        }
+    ).to_csv(tmp_path / "transactions.csv", index=False)
+
+    products, daily, inventory = data_processing.prepare_datasets(
+        tmp_path / "products.csv", tmp_path / "transactions.csv"
+    )
+
+    assert list(products["product_id"].cat.categories) == ["101", "102"]
+    assert daily["product_id"].tolist() == ["101", "102"]
+    assert inventory.set_index("product_id")["total_sales_to_date"].to_dict() == {"101": 3, "102": 5}
@@ -0,0 +1,116 @@
+"""Tests for the grocery CSV adapter."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.adapters.grocery_csv_adapter import convert_grocery_csv_to_internal
+
+
+def _grocery_rows() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Product_Name": ["Apple", "Milk", "Cheese", "Bread", "Pear", "Plum"],
+            "Catagory": ["Fruits", "Dairy", "Dairy", "Bakery", "Fruits", "Fruits"],
+            "Product_ID": ["10-1", "10-2", "10-3", "10-4", "10-5", "10-6"],
+            "Date_Received": ["1/5/2024", "2/1/2024", "garbage", "", "3/1/2024", "2024-02-01"],
+            "Last_Order_Date": ["2/5/2024", "1/20/2024", "3/1/2024", "4/1/2024", "3/10/2024", "March 3, 2024"],
+            "Expiration_Date": ["3/1/2024", "bad", "", "5/1/2024", "4/1/2024", "2024-04-15"],
+            "Stock_Quantity": [10, 20, 30, 40, 50, 60],
+            "Reorder_Level": [1, 2, 3, 4, 5, 6],
+            "Unit_Price": ["$1.50", "$2,000.00", "3", "$0.99", "$5.00", "$0.75"],
+            "Sales_Volume": [40, 13, 0, 25, 7, 9],
+        }
+    )
+
+
+# Chunk sizes that put the m/d/Y and ISO-dated rows in the same chunk, in
+# separate chunks, and at the start of a chunk
+@pytest.mark.parametrize("chunksize", [1, 2, 5])
+def test_chunked_conversion_matches_single_pass(tmp_path: Path, chunksize: int) -> None:
+    input_csv = tmp_path / "grocery.csv"
+    _grocery_rows().to_csv(input_csv, index=False)
+
+    convert_grocery_csv_to_internal(input_csv, tmp_path / "chunked", chunksize=chunksize)
+    convert_grocery_csv_to_internal(input_csv, tmp_path / "single")
+
+    for name in ("products.csv", "transactions.csv"):
+        pd.testing.assert_frame_equal(
+            pd.read_csv(tmp_path / "chunked" / name), pd.read_csv(tmp_path / "single" / name)
+        )
+
+
+def test_sales_volume_is_spread_over_daily_transactions(tmp_path: Path) -> None:
+    input_csv = tmp_path / "grocery.csv"
+    _grocery_rows().to_csv(input_csv, index=False)
+
+    convert_grocery_csv_to_internal(input_csv, tmp_path / "out", chunksize=2)
+
+    products = pd.read_csv(tmp_path / "out" / "products.csv")
+    tx = pd.read_csv(tmp_path / "out" / "transactions.csv", parse_dates=["date"])
+    # Zero-volume and unparseable-date rows still become products
+    assert products["product_id"].tolist() == ["10-1", "10-2", "10-3", "10-4", "10-5", "10-6"]
+    assert products["unit_cost"].tolist() == [1.5, 2000.0, 3.0, 0.99, 5.0, 0.75]
+    assert products["expiration_date"].isna().tolist() == [False, True, True, False, False, False]
+    assert tx.groupby("product_id")["sales"].sum().to_dict() == {
+        "10-1": 40,
+        "10-2": 13,
+        "10-4": 25,
+        "10-5": 7,
+        "10-6": 9,
+    }
+    assert (tx["sales"] > 0).all()
+    # Reversed received/last-order dates are swapped rather than dropped
+    milk = tx.loc[tx["product_id"] == "10-2", "date"]
+    assert milk.min() >= pd.Timestamp("2024-01-20") and milk.max() <= pd.Timestamp("2024-02-01")
+    # A missing received date falls back to 90 days before today
+    bread = tx.loc[tx["product_id"] == "10-4", "date"]
+    fallback = pd.Timestamp.today().normalize() - pd.Timedelta(days=90)
+    assert bread.min() >= pd.Timestamp("2024-04-01") and bread.max() <= fallback
+    # Dates in a different format than the rest of the chunk still parse
+    plum = tx.loc[tx["product_id"] == "10-6", "date"]
+    assert plum.min() >= pd.Timestamp("2024-02-01") and plum.max() <= pd.Timestamp("2024-03-03")
+    assert products.loc[products["product_id"] == "10-6", "expiration_date"].item() == "2024-04-15"
+
+
+@pytest.mark.parametrize("chunksize", [1, 2, 5])
+def test_chunked_parquet_matches_single_pass(tmp_path: Path, chunksize: int) -> None:
+    pytest.importorskip("pyarrow")
+    input_csv = tmp_path / "grocery.csv"
+    _grocery_rows().to_csv(input_csv, index=False)
+
+    convert_grocery_csv_to_internal(input_csv, tmp_path / "chunked", file_format="parquet", chunksize=chunksize)
+    convert_grocery_csv_to_internal(input_csv, tmp_path / "single", file_format="parquet")
+
+    for name in ("products.parquet", "transactions.parquet"):
+        pd.testing.assert_frame_equal(
+            pd.read_parquet(tmp_path / "chunked" / name), pd.read_parquet(tmp_path / "single" / name)
+        )
+
+
+@pytest.mark.parametrize("file_format", ["csv", "parquet"])
+def test_empty_input_writes_header_only_files(tmp_path: Path, file_format: str) -> None:
+    if file_format == "parquet":
+        pytest.importorskip("pyarrow")
+    input_csv = tmp_path / "grocery.csv"
+    _grocery_rows().head(0).to_csv(input_csv, index=False)
+
+    convert_grocery_csv_to_internal(input_csv, tmp_path / "out", file_format=file_format)
+
+    read = pd.read_csv if file_format == "csv" else pd.read_parquet
+    products = read(tmp_path / "out" / f"products.{file_format}")
+    tx = read(tmp_path / "out" / f"transactions.{file_format}")
+    assert products.empty and tx.empty
+    assert list(products.columns) == [
+        "product_id",
+        "category",
+        "lead_time",
+        "reorder_level",
+        "initial_stock",
+        "unit_cost",
+        "expiration_date",
+        "current_stock",
+    ]
+    assert list(tx.columns) == ["date", "product_id", "category", "sales"]
@@ -0,0 +1,63 @@
+"""Tests for reorder recommendations."""
+from __future__ import annotations
+
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+from src import model
+
+
+def _forecast(product_id: str, yhat, start: dt.date) -> model.ForecastResult:
+    ds = pd.date_range(start, periods=len(yhat), freq="D")
+    return model.ForecastResult(
+        product_id=product_id,
+        forecast_df=pd.DataFrame({"ds": ds, "yhat": np.asarray(yhat, dtype=float)}),
+        total_demand_30=float(np.sum(yhat)),
+    )
+
+
+def test_suggest_reorder_handles_expiry_lead_time_and_ragged_forecasts() -> None:
+    today = dt.date.today()
+    inventory = pd.DataFrame(
+        {
+            "product_id": ["A", "B", "C", "D", "E"],
+            "lead_time": [1, 0, 4, 3, 5],
+            "current_stock": [10, 0, 5, 7, 1],
+            "reorder_level": [2, 0, 1, 0, 0],
+            "expiration_date": [
+                None,
+                today - dt.timedelta(days=1),
+                today + dt.timedelta(days=2),
+                None,
+                None,
+            ],
+        }
+    )
+    forecasts = [
+        _forecast("A", [1, 2, 3, 4, 5], today),
+        # Longer history: only the last horizon_days rows count as future
+        _forecast("B", [100, 100, 100, 1, 1, 1, 1, 1], today - dt.timedelta(days=3)),
+        # Shorter than the horizon, with a negative prediction clipped to zero
+        _forecast("C", [2, -1, 4], today),
+        _forecast("E", [3, 3], today),
+    ]
+
+    reorder = model.suggest_reorder(inventory, forecasts, horizon_days=5).set_index("product_id")
+
+    # D has no forecast and is left out
+    assert reorder.index.tolist() == ["A", "B", "C", "E"]
+    # lead_time 0 is treated as one day
+    assert reorder["lead_time"].tolist() == [1, 1, 4, 5]
+    # No expiry: full lead time; past expiry: nothing sells; future expiry: capped at 2 days;
+    # E's two-day forecast is padded with its final cumulative demand
+    np.testing.assert_allclose(reorder["projected_demand_lead_time"], [1.0, 0.0, 2.0, 6.0])
+    assert reorder["recommended_reorder_qty"].tolist() == [0, 0, 0, 6]
+    assert reorder["needs_reorder"].tolist() == [False, False, False, True]
+    # Waste is only estimated for stock that expires after today
+    assert np.isnan(reorder.loc[["A", "B", "E"], "waste_estimate"]).all()
+    assert reorder.loc["C", "waste_estimate"] == 3.0
+    # A crosses its reorder level on day 3 and needs ordering a day earlier
+    assert reorder.loc["A", "next_order_date"] == today + dt.timedelta(days=2)
+    assert reorder.loc["E", "next_order_date"] == today
@@ -2,14 +2,21 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Tuple
+
+import pandas as pd
+import pytest
 
 from scripts.generate_synthetic import main as generate_synthetic
 from src import pipeline
 
 
-def test_pipeline_runs_with_synthetic(tmp_path: Path) -> None:
-    data_dir = tmp_path / "data"
-    output_dir = tmp_path / "outputs"
+@pytest.fixture(scope="session")
+def synthetic_run(tmp_path_factory: pytest.TempPathFactory) -> Tuple[Path, pipeline.PipelineOutputs]:
+    # Generate and run once per session; tests below only inspect the results
+    base = tmp_path_factory.mktemp("pipeline")
+    data_dir = base / "data"
+    output_dir = base / "outputs"
     generate_synthetic(out_dir=data_dir, n_products=10, start="2024-01-01", end="2024-03-31", seed=7)
 
     results = pipeline.run_pipeline(
@@ -19,9 +26,55 @@ def test_pipeline_runs_with_synthetic(tmp_path: Path) -> None:
         horizon_days=14,
         plot_examples=1,
     )
+    return output_dir, results
+
+
+def test_pipeline_runs_with_synthetic(synthetic_run: Tuple[Path, pipeline.PipelineOutputs]) -> None:
+    output_dir, results = synthetic_run
 
     assert not results.abc.empty
     assert not results.velocity.empty
     assert not results.seasonality.empty
     assert not results.reorder.empty
     assert any(output_dir.glob("plots/forecast_*.png"))
+
+
+def test_pipeline_writes_result_tables(synthetic_run: Tuple[Path, pipeline.PipelineOutputs]) -> None:
+    output_dir, results = synthetic_run
+
+    for name in ("abc_classification", "velocity_metrics", "seasonality_strength", "reorder_recommendations"):
+        assert (output_dir / f"{name}.csv").exists()
+    assert set(results.plots) >= {"stock_vs_sales", "abc_pie"}
+    assert all(path.exists() for path in results.plots.values())
+
+
+def test_pipeline_runs_with_parquet_inputs(tmp_path: Path) -> None:
+    data_dir = tmp_path / "data"
+    output_dir = tmp_path / "outputs"
+    generate_synthetic(
+        out_dir=data_dir,
+        n_products=5,
+        start="2024-01-01",
+        end="2024-02-29",
+        seed=3,
+        file_format="parquet",
+    )
+    assert not (data_dir / "transactions.csv").exists()
+
+    results = pipeline.run_pipeline(
+        data_dir=data_dir,
+        output_dir=output_dir,
+        model_name="lstm_stub",
+        horizon_days=7,
+        plot_examples=0,
+        data_format="parquet",
+        output_format="feather",
+    )
+
+    assert not results.abc.empty
+    assert not results.reorder.empty
+    assert not (output_dir / "reorder_recommendations.csv").exists()
+    assert results.plots == {}
+    assert not (output_dir / "plots").exists()
+    reorder = pd.read_feather(output_dir / "reorder_recommendations.feather")
+    assert reorder["product_id"].tolist() == results.reorder["product_id"].tolist()
@@ -0,0 +1,40 @@
+"""Tests for plot rendering."""
+from __future__ import annotations
+
+import os
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+from src import visualization
+
+
+def _pid_plot() -> Path:
+    return Path(str(os.getpid()))
+
+
+def _fake_main(monkeypatch: pytest.MonkeyPatch, path: Path, source: str) -> None:
+    path.write_text(source)
+    main = types.ModuleType("__main__")
+    main.__file__ = str(path)
+    monkeypatch.setitem(sys.modules, "__main__", main)
+    # Let render_plots consider a pool even on single-CPU machines
+    monkeypatch.setattr(visualization.os, "cpu_count", lambda: 2)
+
+
+def test_unguarded_main_renders_in_process(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    _fake_main(monkeypatch, tmp_path / "script.py", "print('would re-run the pipeline')\n")
+
+    paths = visualization.render_plots([(_pid_plot, {})] * 2, max_workers=2)
+
+    assert paths == [Path(str(os.getpid()))] * 2
+
+
+def test_guarded_main_renders_in_workers(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    _fake_main(monkeypatch, tmp_path / "script.py", "if __name__ == '__main__':\n    raise SystemExit\n")
+
+    paths = visualization.render_plots([(_pid_plot, {})] * 2, max_workers=2)
+
+    assert Path(str(os.getpid())) not in paths